@@ -2,19 +2,9 @@ import os
 import json
 import logging
 from dotenv import load_dotenv
-from langchain_community.llms import Ollama
-from langchain_community.embeddings import OllamaEmbeddings
-from langchain.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.vectorstores import Chroma
-from langchain.chains import create_retrieval_chain
-from langchain.chains.combine_documents import create_stuff_documents_chain
-from langchain_core.prompts import ChatPromptTemplate
-from langchain.prompts import (
-    ChatPromptTemplate,
-    SystemMessagePromptTemplate,
-    HumanMessagePromptTemplate
-)
+
+# langchain, Chroma and the document loaders are imported inside the methods
+# that need them so that importing this module (and booting the API) stays cheap.
 
 # Load environment variables
 load_dotenv()
@@ -58,11 +48,25 @@ class Profile:
         PROFILES_FILE (str): Path to the profiles JSON file.
         BASE_URL (str): Base URL for the LLM and embeddings.
         Profiles (list): A list of all loaded profiles.
+        DEFAULT_RETRIEVAL_SETTINGS (dict): Retrieval settings used when a profile does not override them.
+        DEFAULT_SPLIT_SETTINGS (dict): Chunking settings, in tokens, used when a profile does not override them.
     """
 
     PROFILES_FILE = os.getenv("PROFILES_FILE", "models/profiles.json")
     BASE_URL = os.getenv("BASE_URL", "http://127.0.0.1:11434")
     Profiles = []
+    DEFAULT_RETRIEVAL_SETTINGS = {
+        "fetch_k": 20,
+        "k": 4,
+        "mmr_lambda": 0.5,
+        "lexical_weight": 0.3,
+        "score_threshold": None,
+        "duplicate_threshold": 0.98
+    }
+    DEFAULT_SPLIT_SETTINGS = {
+        "chunk_tokens": 512,
+        "overlap_tokens": 64
+    }
 
     def __init__(
         self,
@@ -75,7 +79,10 @@ class Profile:
         files_path=None,
         train=False,
         use_only_context=False,
-        language=LANGUAGES.ENGLISH
+        language=LANGUAGES.ENGLISH,
+        retrieval_settings=None,
+        split_settings=None,
+        embedding_model=None
     ):
         """
         Initializes a Profile instance.
@@ -91,9 +98,15 @@ class Profile:
             train (bool, optional): Whether to train the profile on initialization.
             use_only_context (bool, optional): Use only context for answers.
             language (str, optional): Language code ("en" or "ar").
+            retrieval_settings (dict, optional): Overrides for ``DEFAULT_RETRIEVAL_SETTINGS``
+                (fetch_k, k, mmr_lambda, lexical_weight, score_threshold, duplicate_threshold).
+            split_settings (dict, optional): Overrides for ``DEFAULT_SPLIT_SETTINGS``
+                (chunk_tokens, overlap_tokens).
+            embedding_model (str, optional): Model used for embeddings; defaults to ``model``.
         """
         self.name = name
         self.model = model
+        self.embedding_model = embedding_model or model
         self.llm = None
         self.embed_model = None
         self.vector_store = None
@@ -107,13 +120,22 @@ class Profile:
         self.type = type
         self.use_only_context = use_only_context
         self.language = language
+        # Only explicit overrides are kept (and saved) so later default changes reach every profile
+        self.retrieval_settings = dict(retrieval_settings or {})
+        self.split_settings = dict(split_settings or {})
+        self._initialized = False
 
         self.initialize_profile(train)
 
     # Class methods for profile management
     @classmethod
     def load_profiles(cls):
-        """Loads profiles from the profiles JSON file."""
+        """Loads profiles from the profiles JSON file.
+
+        Profiles are rebuilt from the plain JSON written by ``save_profiles``;
+        there is no separate precomputed snapshot. Loading stays cheap because
+        no model, embedding or vector store is touched until a profile is queried.
+        """
         if os.path.exists(cls.PROFILES_FILE):
             logger.info(f"Loading profiles from '{cls.PROFILES_FILE}'")
             with open(cls.PROFILES_FILE, "r") as f:
@@ -151,7 +173,10 @@ class Profile:
         files_path=None,
         train=False,
         use_only_context=False,
-        language=LANGUAGES.ENGLISH
+        language=LANGUAGES.ENGLISH,
+        retrieval_settings=None,
+        split_settings=None,
+        embedding_model=None
     ):
         """Creates and adds a new profile."""
         profile = cls(
@@ -164,7 +189,10 @@ class Profile:
             files_path,
             train,
             use_only_context,
-            language
+            language,
+            retrieval_settings,
+            split_settings,
+            embedding_model
         )
         cls.add_profile_instance(profile)
 
@@ -188,25 +216,42 @@ class Profile:
 
     # Instance methods for initialization and training
     def initialize_profile(self, train=False):
-        """Initializes the profile's model and components."""
-        logger.info(f"Initializing profile '{self.name}' with model '{self.model}'")
-        self._initialize_model()
+        """Initializes the profile's model and components.
+
+        Without ``train`` the heavy components are deferred to the first query
+        (see ``_ensure_initialized``), so loading profiles at startup is cheap.
+        """
         if train:
+            logger.info(f"Initializing profile '{self.name}' with model '{self.model}'")
             self.train_profile()
         else:
-            self._load_vector_store()
+            logger.debug(f"Deferring initialization of profile '{self.name}' until first query")
+
+    def _ensure_initialized(self):
+        """Loads the model, vector store and retrieval chain on first use."""
+        if self._initialized:
+            return
+        logger.info(f"Initializing profile '{self.name}' with model '{self.model}'")
+        self._initialize_model()
+        self._load_vector_store()
         self._initialize_retriever()
         self._create_retrieval_chain()
+        self._initialized = True
 
     def _initialize_model(self):
         """Initializes the LLM and embedding model instances."""
+        from langchain_community.llms import Ollama
+        from langchain_community.embeddings import OllamaEmbeddings
+
         logger.debug(f"Initializing LLM and embeddings for profile '{self.name}'")
         self.llm = Ollama(model=self.model, base_url=self.BASE_URL)
-        self.embed_model = OllamaEmbeddings(model=self.model, base_url=self.BASE_URL)
+        self.embed_model = OllamaEmbeddings(model=self.embedding_model, base_url=self.BASE_URL)
 
     def _load_vector_store(self):
         """Loads the vector store from the specified directory."""
         if os.path.exists(self.chroma_path):
+            from langchain.vectorstores import Chroma
+
             logger.info(f"Loading vector store from '{self.chroma_path}'")
             self.vector_store = Chroma(
                 persist_directory=self.chroma_path,
@@ -217,16 +262,28 @@ class Profile:
             self.vector_store = None
 
     def _initialize_retriever(self):
-        """Initializes the retriever from the vector store."""
+        """Initializes the reranking retriever from the vector store and retrieval settings."""
         if self.vector_store:
-            logger.debug(f"Initializing retriever for profile '{self.name}'")
-            self.retriever = self.vector_store.as_retriever()
+            from rerank import RerankingRetriever
+
+            settings = {**self.DEFAULT_RETRIEVAL_SETTINGS, **self.retrieval_settings}
+            logger.debug(f"Initializing retriever for profile '{self.name}' with {settings}")
+            self.retriever = RerankingRetriever(
+                vector_store=self.vector_store,
+                **settings
+            )
         else:
             logger.error(f"Vector store not loaded for profile '{self.name}'")
             self.retriever = None
 
     def _create_prompt(self, prompt):
         """Creates a prompt template based on language and context settings."""
+        from langchain.prompts import (
+            ChatPromptTemplate,
+            SystemMessagePromptTemplate,
+            HumanMessagePromptTemplate
+        )
+
         try:
             if self.language == LANGUAGES.ARABIC:
                 default_prompt = (
@@ -265,6 +322,9 @@ class Profile:
 
         self.retriever_prompt = self._create_prompt(self.prompt)
         if self.type in ["RAG-pdf", "RAG-txt"]:
+            from langchain.chains import create_retrieval_chain
+            from langchain.chains.combine_documents import create_stuff_documents_chain
+
             combine_docs_chain = create_stuff_documents_chain(self.llm, self.retriever_prompt)
             self.retrieval_chain = create_retrieval_chain(
                 retriever=self.retriever,
@@ -276,7 +336,9 @@ class Profile:
             self.retrieval_chain = None
 
     def train_profile(self):
-        """Trains the profile based on its type."""
+        """Trains the profile based on its type and rebuilds its retriever and chain."""
+        if self.embed_model is None:
+            self._initialize_model()
         if self.type == "RAG-pdf":
             logger.info(f"Training RAG-pdf profile '{self.name}'")
             self._train_pdf_profile()
@@ -286,31 +348,42 @@ class Profile:
         else:
             logger.warning(f"Training not supported for profile type '{self.type}'")
 
+        # Rebuild on top of the new store so a retrained profile never keeps a stale retriever
+        self._initialize_retriever()
+        self._create_retrieval_chain()
+        self._initialized = True
+
+    def _split(self, documents):
+        """Splits ``(text, metadata)`` pairs into token-sized chunks for the embedding model."""
+        from splitter import max_chunk_tokens, split_documents
+
+        settings = {**self.DEFAULT_SPLIT_SETTINGS, **self.split_settings}
+        chunk_tokens = max_chunk_tokens(self.embedding_model, settings["chunk_tokens"])
+        texts, metadatas = split_documents(
+            documents,
+            chunk_tokens=chunk_tokens,
+            overlap_tokens=settings["overlap_tokens"]
+        )
+        logger.info(f"Split {len(documents)} documents into {len(texts)} chunks of up to {chunk_tokens} tokens")
+        return texts, metadatas
+
     def _train_pdf_profile(self):
         """Trains a profile using PDF documents."""
+        from langchain.document_loaders import PyPDFLoader
+        from langchain.vectorstores import Chroma
+
         documents = []
         for pdf_path in self.files_path:
             logger.debug(f"Loading PDF file '{pdf_path}'")
             loader = PyPDFLoader(pdf_path)
-            documents.extend(loader.load())
-            
-        base_chunk_size = 1000
-        base_overlap = 100
-        
-        doc_lengths = [len(doc.page_content) for doc in documents if hasattr(doc, 'page_content')]
-
-        avg_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else base_chunk_size
-        
-        # Adjust parameters dynamically
-        chunk_size = min(max(int(avg_length * 0.8), 1000), base_chunk_size)
-        overlap = min(max(int(chunk_size * 0.1), 100), base_overlap)
+            documents.extend((page.page_content, page.metadata) for page in loader.load())
 
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=overlap)
-        chunks = text_splitter.split_documents(documents)
+        texts, metadatas = self._split(documents)
 
-        self.vector_store = Chroma.from_documents(
-            chunks,
+        self.vector_store = Chroma.from_texts(
+            texts,
             embedding=self.embed_model,
+            metadatas=metadatas,
             persist_directory=self.chroma_path
         )
         
@@ -318,18 +391,20 @@ class Profile:
 
     def _train_txt_profile(self):
         """Trains a profile using text documents."""
-        all_text = ''
+        from langchain.vectorstores import Chroma
+
+        documents = []
         for text_file in self.files_path:
             logger.debug(f"Loading text file '{text_file}'")
             with open(text_file, 'r') as f:
-                all_text += f.read()
+                documents.append((f.read(), {"source": text_file, "page": 0}))
 
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        chunks = text_splitter.split_text(all_text)
+        texts, metadatas = self._split(documents)
 
         self.vector_store = Chroma.from_texts(
-            chunks,
+            texts,
             embedding=self.embed_model,
+            metadatas=metadatas,
             persist_directory=self.chroma_path
         )
         logger.info(f"Vector store created at '{self.chroma_path}'")
@@ -344,6 +419,7 @@ class Profile:
         Returns:
             str: The response from the model or an error message.
         """
+        self._ensure_initialized()
         if not self.retrieval_chain:
             logger.error(f"Profile '{self.name}' is not initialized or retrieval chain is missing")
             return "Profile is not initialized"
@@ -357,13 +433,16 @@ class Profile:
         return {
             "name": self.name,
             "model": self.model,
+            "embedding_model": self.embedding_model,
             "prompt": self.prompt,
             "description": self.description,
             "file_path": self.file_path,
             "files_path": self.files_path,
             "type": self.type,
             "use_only_context": self.use_only_context,
-            "language": self.language
+            "language": self.language,
+            "retrieval_settings": self.retrieval_settings,
+            "split_settings": self.split_settings
         }
 
     def __str__(self):
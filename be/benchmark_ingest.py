@@ -0,0 +1,83 @@
+"""
+Ingest benchmark for the backend.
+
+Splits a corpus of ``.txt`` and ``.pdf`` files with the previous character
+splitter (1000 characters, 100 overlap) and with the token-aware splitter, and
+reports the number of chunks, embedding calls and split time for each.
+``OllamaEmbeddings`` sends one request per chunk, so embedding calls equal chunks.
+
+Usage:
+    python benchmark_ingest.py FILE [FILE ...] [--embedding-model llama3.1:latest] [--chunk-tokens 512] [--overlap-tokens 64]
+"""
+
+import argparse
+import os
+import time
+
+from splitter import count_tokens, max_chunk_tokens, split_documents
+
+
+def load_documents(paths):
+    """Loads ``(text, metadata)`` pairs, one per text file or PDF page."""
+    documents = []
+    for path in paths:
+        if os.path.splitext(path)[1].lower() == ".pdf":
+            from langchain.document_loaders import PyPDFLoader
+
+            documents.extend((page.page_content, page.metadata) for page in PyPDFLoader(path).load())
+        else:
+            with open(path, "r") as f:
+                documents.append((f.read(), {"source": path, "page": 0}))
+    return documents
+
+
+def split_baseline(documents):
+    """Splits documents the way profiles were trained before the token-aware splitter.
+
+    PDF pages were split one by one, while all text files of a profile were
+    concatenated and split as a single text.
+    """
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+    texts = []
+    all_text = ''
+    for text, metadata in documents:
+        if os.path.splitext(metadata["source"])[1].lower() == ".pdf":
+            texts.extend(text_splitter.split_text(text))
+        else:
+            all_text += text
+    if all_text:
+        texts.extend(text_splitter.split_text(all_text))
+    return texts
+
+
+def report(label, texts, elapsed):
+    """Prints a summary line for one splitter."""
+    tokens = sum(count_tokens(text) for text in texts)
+    print(f"{label:<14} chunks {len(texts):6d}  embed calls {len(texts):6d}  "
+          f"tokens embedded {tokens:8d}  split {elapsed * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend ingest (splitting) benchmark")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--embedding-model", default="llama3.1:latest")
+    parser.add_argument("--chunk-tokens", type=int, default=512)
+    parser.add_argument("--overlap-tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    documents = load_documents(args.files)
+    chunk_tokens = max_chunk_tokens(args.embedding_model, args.chunk_tokens)
+
+    start = time.perf_counter()
+    baseline = split_baseline(documents)
+    report("baseline", baseline, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    texts, _ = split_documents(documents, chunk_tokens, args.overlap_tokens)
+    report("token-aware", texts, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
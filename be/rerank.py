@@ -0,0 +1,166 @@
+"""
+Local reranking stage for profile retrieval.
+
+Fetches ``fetch_k`` candidates from the Chroma vector store together with their
+stored embeddings, then scores them with a blend of cosine similarity and
+lexical overlap with the query, and selects ``k`` of them with maximal marginal
+relevance (MMR), skipping near-duplicates of chunks already selected.
+Everything after the candidate fetch runs locally with numpy; no extra model
+calls are made.
+"""
+
+import re
+import logging
+from typing import Any, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """Returns the set of lowercased word tokens of a text (works for English and Arabic)."""
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+
+def lexical_overlap(query, texts):
+    """Computes the fraction of query terms found in each text.
+
+    Args:
+        query (str): The input query.
+        texts (list): Candidate texts.
+
+    Returns:
+        np.ndarray: One score in [0, 1] per text.
+    """
+    query_terms = tokenize(query)
+    if not query_terms:
+        return np.zeros(len(texts))
+    return np.array(
+        [len(query_terms & tokenize(text)) / len(query_terms) for text in texts]
+    )
+
+
+def normalize_rows(matrix):
+    """L2-normalizes each row of a matrix, leaving zero rows untouched."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def maximal_marginal_relevance(relevance, embeddings, k, lambda_mult=0.5, duplicate_threshold=None):
+    """Selects up to ``k`` candidates balancing relevance against redundancy.
+
+    Args:
+        relevance (np.ndarray): Relevance score of each candidate, shape ``(n,)``.
+        embeddings (np.ndarray): Normalized candidate embeddings, shape ``(n, d)``.
+        k (int): Number of candidates to select.
+        lambda_mult (float): 1 favours relevance only, 0 favours diversity only.
+        duplicate_threshold (float, optional): Candidates whose similarity to a
+            selected one is at or above this value are never selected.
+
+    Returns:
+        list: Indices of the selected candidates, in selection order; fewer
+            than ``k`` if only duplicates remain.
+    """
+    n = len(relevance)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    similarity = embeddings @ embeddings.T
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of every candidate to anything already selected
+    redundancy = similarity[selected[0]].copy()
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+    if duplicate_threshold is not None:
+        available &= similarity[selected[0]] < duplicate_threshold
+
+    while len(selected) < k and available.any():
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        if duplicate_threshold is not None:
+            available &= similarity[best] < duplicate_threshold
+        np.maximum(redundancy, similarity[best], out=redundancy)
+
+    return selected
+
+
+class RerankingRetriever(BaseRetriever):
+    """
+    Retriever that reranks Chroma candidates locally with MMR and lexical overlap.
+
+    Candidates and their stored embeddings are read through the private
+    ``_collection`` attribute of langchain's ``Chroma`` wrapper. Vector stores
+    without it fall back to their own ``max_marginal_relevance_search_by_vector``
+    (no lexical scoring, threshold or duplicate cutoff).
+
+    Attributes:
+        vector_store (Chroma): The profile's vector store.
+        fetch_k (int): Number of candidates fetched from the vector store.
+        k (int): Number of documents passed on to the chain.
+        mmr_lambda (float): MMR trade-off between relevance (1) and diversity (0).
+        lexical_weight (float): Weight of lexical overlap in the relevance score.
+        score_threshold (float, optional): Minimum relevance score to keep a candidate.
+        duplicate_threshold (float, optional): Embedding similarity at or above which
+            a candidate counts as a duplicate of an already selected one.
+    """
+
+    vector_store: Any
+    fetch_k: int = 20
+    k: int = 4
+    mmr_lambda: float = 0.5
+    lexical_weight: float = 0.3
+    score_threshold: Optional[float] = None
+    duplicate_threshold: Optional[float] = 0.98
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        query_embedding = self.vector_store.embeddings.embed_query(query)
+        if not hasattr(self.vector_store, "_collection"):
+            logger.debug("Vector store has no Chroma collection; using its own MMR search")
+            return self.vector_store.max_marginal_relevance_search_by_vector(
+                query_embedding, k=self.k, fetch_k=max(self.fetch_k, self.k), lambda_mult=self.mmr_lambda
+            )
+        result = self.vector_store._collection.query(
+            query_embeddings=[query_embedding],
+            n_results=max(self.fetch_k, self.k),
+            include=["documents", "metadatas", "embeddings"],
+        )
+        texts = result["documents"][0]
+        if not texts:
+            return []
+        metadatas = result["metadatas"][0] or [None] * len(texts)
+
+        embeddings = normalize_rows(np.asarray(result["embeddings"][0], dtype=np.float32))
+        query_vector = normalize_rows(np.asarray(query_embedding, dtype=np.float32))
+        relevance = (
+            (1 - self.lexical_weight) * (embeddings @ query_vector)
+            + self.lexical_weight * lexical_overlap(query, texts)
+        )
+
+        candidates = np.arange(len(texts))
+        if self.score_threshold is not None:
+            candidates = candidates[relevance >= self.score_threshold]
+            if not len(candidates):
+                logger.debug(f"No candidates above score threshold {self.score_threshold}")
+                return []
+
+        selected = maximal_marginal_relevance(
+            relevance[candidates], embeddings[candidates], self.k, self.mmr_lambda, self.duplicate_threshold
+        )
+        logger.debug(f"Reranked {len(texts)} candidates down to {len(selected)}")
+        return [
+            Document(page_content=texts[i], metadata=metadatas[i] or {})
+            for i in candidates[selected]
+        ]
@@ -19,7 +19,6 @@ import shutil
 from LLM_profile import Profile, LANGUAGES  # Importing LANGUAGES
 import logging
 from dotenv import load_dotenv
-import requests
 from fastapi.middleware.cors import CORSMiddleware
 
 # Load environment variables
@@ -52,6 +51,9 @@ async def get_available_models():
     Returns:
         dict: A dictionary containing a list of model names.
     """
+    # Imported here rather than at module level to keep server boot cheap
+    import requests
+
     try:
         base_url = os.getenv("BASE_URL", "http://127.0.0.1:11434")
         response = requests.get(f'{base_url}/api/tags')
@@ -88,6 +90,7 @@ async def add_new_profile(
     train: bool = Form(False),
     use_only_context: bool = Form(False),
     language: str = Form(LANGUAGES.ENGLISH),
+    embedding_model: Optional[str] = Form(None),
     files: Optional[List[UploadFile]] = File(None)
 ):
     """
@@ -102,6 +105,7 @@ async def add_new_profile(
         train (bool, optional): Whether to train the profile on initialization.
         use_only_context (bool, optional): Use only context for answers.
         language (str, optional): Language code ("en" or "ar").
+        embedding_model (str, optional): Model used for embeddings; defaults to ``model``.
         files (List[UploadFile], optional): List of files to upload.
 
     Returns:
@@ -112,6 +116,7 @@ async def add_new_profile(
         logger.info(f"Profile data: name={name}, model={model}, prompt={prompt}, "
                     f"description={description}, text_content={'Yes' if text_content else 'No'}, "
                     f"train={train}, use_only_context={use_only_context}, language={language}, "
+                    f"embedding_model={embedding_model or model}, "
                     f"files={'Yes' if files else 'No'}")
 
         if not files:
@@ -160,6 +165,7 @@ async def add_new_profile(
             train=train,
             use_only_context=use_only_context,
             language=language,
+            embedding_model=embedding_model,
         )
         logger.info(f"Profile '{name}' added successfully")
         return JSONResponse(status_code=201, content={"message": f"Profile '{name}' added successfully"})
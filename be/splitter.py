@@ -0,0 +1,200 @@
+"""
+Token-aware, sentence-aware text splitter for profile training.
+
+Texts are cut at sentence and paragraph boundaries (English and Arabic
+punctuation) and packed into chunks sized in tokens for the embedding model,
+with an overlap also given in tokens. Every chunk carries its source, page,
+character offsets and token count so later stages never need to re-tokenize.
+
+Token counts are a rough local estimate (words split into pieces of at most
+four characters, plus punctuation), so the model's tokenizer never has to be
+loaded. The estimate overcounts English by about 1.5x. It can undercount
+Arabic for WordPiece-based embedding models. Chunks are therefore capped
+below the model's limit (see ``max_chunk_tokens``).
+"""
+
+import os
+import re
+
+# Context window Ollama uses for embeddings (its default num_ctx) unless the
+# profile's embedding model is a dedicated embedding model listed below
+DEFAULT_EMBED_TOKEN_LIMIT = int(os.getenv("EMBED_TOKEN_LIMIT", "2048"))
+
+EMBED_TOKEN_LIMITS = {
+    "nomic-embed-text": 8192,
+    "mxbai-embed-large": 512,
+    "all-minilm": 256,
+}
+
+# Share of the model limit usable by a chunk, and tokens reserved for special tokens
+LIMIT_MARGIN = 0.9
+SPECIAL_TOKENS = 2
+
+TOKEN_PATTERN = re.compile(r"\w{1,4}|[^\w\s]", re.UNICODE)
+
+# Sentence ends: Latin and Arabic terminators (optionally followed by closing
+# quotes or brackets) and whitespace, or a blank line between paragraphs
+SENTENCE_BOUNDARY = re.compile(r"[.!?؟…۔]+[\"'»”)\]]*\s+|\n\s*\n")
+
+
+def count_tokens(text):
+    """Estimates the number of tokens in a text."""
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def embed_token_limit(model):
+    """Returns the token limit of the model used for embeddings (e.g. ``"nomic-embed-text:latest"``)."""
+    return EMBED_TOKEN_LIMITS.get(model.split(":")[0], DEFAULT_EMBED_TOKEN_LIMIT)
+
+
+def max_chunk_tokens(model, chunk_tokens):
+    """Caps ``chunk_tokens`` below the embedding model's limit, leaving room for estimation error."""
+    return min(chunk_tokens, int(embed_token_limit(model) * LIMIT_MARGIN) - SPECIAL_TOKENS)
+
+
+def _sentence_spans(text):
+    """Yields ``(start, end)`` offsets of the sentences in a text, whitespace excluded."""
+    start = 0
+    for match in SENTENCE_BOUNDARY.finditer(text):
+        yield from _strip_span(text, start, match.end())
+        start = match.end()
+    yield from _strip_span(text, start, len(text))
+
+
+def _strip_span(text, start, end):
+    """Yields the span with surrounding whitespace removed, if anything remains."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        yield start, end
+
+
+def _word_windows(text, start, end, max_tokens):
+    """Splits an over-long sentence into word-aligned spans of at most ``max_tokens`` tokens."""
+    window_start = window_end = None
+    window_tokens = 0
+    for match in re.finditer(r"\S+", text[start:end]):
+        word_tokens = count_tokens(match.group())
+        if word_tokens > max_tokens:
+            # A single unbroken run longer than a chunk; cut it at token edges
+            if window_start is not None:
+                yield window_start, window_end, window_tokens
+                window_start = None
+            pieces = list(TOKEN_PATTERN.finditer(match.group()))
+            for i in range(0, len(pieces), max_tokens):
+                group = pieces[i:i + max_tokens]
+                word_start = start + match.start()
+                yield word_start + group[0].start(), word_start + group[-1].end(), len(group)
+            continue
+        if window_start is not None and window_tokens + word_tokens > max_tokens:
+            yield window_start, window_end, window_tokens
+            window_start = None
+        if window_start is None:
+            window_start, window_tokens = start + match.start(), 0
+        window_end = start + match.end()
+        window_tokens += word_tokens
+    if window_start is not None:
+        yield window_start, window_end, window_tokens
+
+
+def _word_tail(text, start, end, max_tokens):
+    """Returns the longest word-aligned tail of a span with at most ``max_tokens`` tokens, or None."""
+    tail_start, tail_tokens = end, 0
+    for match in reversed(list(re.finditer(r"\S+", text[start:end]))):
+        word_tokens = count_tokens(match.group())
+        if tail_tokens + word_tokens > max_tokens:
+            break
+        tail_start = start + match.start()
+        tail_tokens += word_tokens
+    if not tail_tokens:
+        return None
+    return tail_start, end, tail_tokens
+
+
+def split_text(text, chunk_tokens=512, overlap_tokens=64, metadata=None):
+    """Splits a text into sentence-aligned chunks sized in tokens.
+
+    Args:
+        text (str): Text to split.
+        chunk_tokens (int, optional): Maximum tokens per chunk.
+        overlap_tokens (int, optional): Tokens of trailing sentences repeated at the start of the next chunk;
+            a sentence too long to repeat whole contributes its word-aligned tail.
+        metadata (dict, optional): Metadata copied into every chunk (e.g. source and page).
+
+    Returns:
+        list: ``(chunk_text, chunk_metadata)`` pairs; the metadata adds
+            ``start_offset``, ``end_offset`` and ``token_count``.
+
+    Raises:
+        ValueError: If ``chunk_tokens`` is not positive or ``overlap_tokens`` is negative.
+    """
+    if chunk_tokens <= 0:
+        raise ValueError(f"chunk_tokens must be positive, got {chunk_tokens}")
+    if overlap_tokens < 0:
+        raise ValueError(f"overlap_tokens must not be negative, got {overlap_tokens}")
+    overlap_tokens = min(overlap_tokens, chunk_tokens // 2)
+
+    sentences = []
+    for start, end in _sentence_spans(text):
+        tokens = count_tokens(text[start:end])
+        if tokens > chunk_tokens:
+            sentences.extend(_word_windows(text, start, end, chunk_tokens))
+        else:
+            sentences.append((start, end, tokens))
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for sentence in sentences:
+        if current and current_tokens + sentence[2] > chunk_tokens:
+            chunks.append(_make_chunk(text, current, current_tokens, metadata))
+            # Carry trailing sentences over as overlap, as long as they fit
+            carried = []
+            carried_tokens = 0
+            for previous in reversed(current):
+                if carried_tokens + previous[2] > overlap_tokens \
+                        or carried_tokens + previous[2] + sentence[2] > chunk_tokens:
+                    # Too long to carry whole; fill the rest of the overlap with its tail
+                    budget = min(overlap_tokens, chunk_tokens - sentence[2]) - carried_tokens
+                    tail = _word_tail(text, previous[0], previous[1], budget) if budget > 0 else None
+                    if tail:
+                        carried.insert(0, tail)
+                        carried_tokens += tail[2]
+                    break
+                carried.insert(0, previous)
+                carried_tokens += previous[2]
+            current, current_tokens = carried, carried_tokens
+        current.append(sentence)
+        current_tokens += sentence[2]
+    if current:
+        chunks.append(_make_chunk(text, current, current_tokens, metadata))
+    return chunks
+
+
+def _make_chunk(text, sentences, token_count, metadata):
+    """Builds a ``(chunk_text, chunk_metadata)`` pair from consecutive sentence spans."""
+    start, end = sentences[0][0], sentences[-1][1]
+    chunk_metadata = dict(metadata or {})
+    chunk_metadata.update(start_offset=start, end_offset=end, token_count=token_count)
+    return text[start:end], chunk_metadata
+
+
+def split_documents(documents, chunk_tokens=512, overlap_tokens=64):
+    """Splits ``(text, metadata)`` pairs (e.g. one per PDF page) into chunks.
+
+    Args:
+        documents (iterable): ``(text, metadata)`` pairs.
+        chunk_tokens (int, optional): Maximum tokens per chunk.
+        overlap_tokens (int, optional): Overlap between consecutive chunks, in tokens.
+
+    Returns:
+        tuple: ``(texts, metadatas)`` lists ready for ``Chroma.from_texts``.
+    """
+    texts, metadatas = [], []
+    for text, metadata in documents:
+        for chunk_text, chunk_metadata in split_text(text, chunk_tokens, overlap_tokens, metadata):
+            texts.append(chunk_text)
+            metadatas.append(chunk_metadata)
+    return texts, metadatas
@@ -0,0 +1,67 @@
+import numpy as np
+
+from rerank import RerankingRetriever, maximal_marginal_relevance, normalize_rows
+
+
+class FakeEmbeddings:
+    def embed_query(self, query):
+        return [1.0, 0.0, 0.0]
+
+
+class FakeCollection:
+    def __init__(self, documents, embeddings):
+        self.documents = documents
+        self.embeddings = embeddings
+
+    def query(self, query_embeddings, n_results, include):
+        return {
+            "documents": [self.documents[:n_results]],
+            "metadatas": [[{"id": i} for i in range(len(self.documents[:n_results]))]],
+            "embeddings": [self.embeddings[:n_results]],
+        }
+
+
+class FakeChroma:
+    def __init__(self, documents, embeddings):
+        self.embeddings = FakeEmbeddings()
+        self._collection = FakeCollection(documents, embeddings)
+
+
+def test_mmr_skips_duplicates_at_cutoff():
+    embeddings = normalize_rows(np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]]))
+    relevance = np.array([0.9, 0.9, 0.1])
+
+    # Weighted towards relevance, plain MMR picks the duplicate
+    assert maximal_marginal_relevance(relevance, embeddings, 2, 0.9) == [0, 1]
+    assert maximal_marginal_relevance(relevance, embeddings, 2, 0.9, duplicate_threshold=0.98) == [0, 2]
+
+
+def test_mmr_returns_fewer_than_k_when_only_duplicates_remain():
+    embeddings = normalize_rows(np.ones((3, 2)))
+    relevance = np.array([0.2, 0.9, 0.5])
+
+    assert maximal_marginal_relevance(relevance, embeddings, 3, 0.5, duplicate_threshold=0.98) == [1]
+
+
+def test_retriever_drops_exact_duplicate():
+    store = FakeChroma(
+        ["cats purr", "cats purr", "dogs bark loudly", "cats sleep"],
+        [[0.9, 0.1, 0.0], [0.9, 0.1, 0.0], [0.5, 0.5, 0.3], [0.8, 0.3, 0.1]],
+    )
+    retriever = RerankingRetriever(vector_store=store, k=2)
+
+    assert [doc.page_content for doc in retriever.invoke("cats purr")] == ["cats purr", "cats sleep"]
+
+
+def test_retriever_maps_thresholded_candidates_back_to_documents():
+    # Only the documents at positions 1 and 3 clear the threshold
+    store = FakeChroma(
+        ["off topic", "first match", "also off topic", "second match"],
+        [[0.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [0.9, 0.4, 0.0]],
+    )
+    retriever = RerankingRetriever(vector_store=store, k=4, lexical_weight=0.0, score_threshold=0.5)
+
+    documents = retriever.invoke("match")
+
+    assert [doc.page_content for doc in documents] == ["first match", "second match"]
+    assert [doc.metadata["id"] for doc in documents] == [1, 3]
@@ -0,0 +1,61 @@
+import pytest
+
+from splitter import count_tokens, max_chunk_tokens, split_text
+
+LONG_SENTENCE = " ".join(f"word{i}" for i in range(35)) + ". "
+
+
+def assert_chunks_consistent(text, chunks, chunk_tokens):
+    for chunk_text, metadata in chunks:
+        assert text[metadata["start_offset"]:metadata["end_offset"]] == chunk_text
+        assert count_tokens(chunk_text) == metadata["token_count"]
+        assert metadata["token_count"] <= chunk_tokens
+
+
+def test_offsets_and_token_counts_round_trip():
+    text = "This is sentence one. Here is two! And three?\n\nNew paragraph here. " * 40
+    chunks = split_text(text, 100, 20, {"source": "a.txt", "page": 3})
+
+    assert len(chunks) > 1
+    assert_chunks_consistent(text, chunks, 100)
+    assert all(metadata["source"] == "a.txt" and metadata["page"] == 3 for _, metadata in chunks)
+
+
+def test_long_last_sentence_still_overlaps():
+    text = LONG_SENTENCE * 30
+    assert count_tokens(LONG_SENTENCE) == 71
+
+    chunks = split_text(text, 512, 64)
+
+    assert_chunks_consistent(text, chunks, 512)
+    for (_, previous), (_, current) in zip(chunks, chunks[1:]):
+        overlap = text[current["start_offset"]:previous["end_offset"]]
+        assert 0 < count_tokens(overlap) <= 64
+
+
+def test_arabic_chunks_end_on_sentence_boundaries():
+    text = "مرحبا بكم في المكتبة. هذا نص عربي طويل؟ نعم بالتأكيد! " * 30
+    chunks = split_text(text, 40, 0)
+
+    assert len(chunks) > 1
+    assert_chunks_consistent(text, chunks, 40)
+    assert all(chunk_text[-1] in ".؟!" for chunk_text, _ in chunks)
+
+
+def test_unbroken_run_is_cut_to_size():
+    text = "x" * 5000
+    chunks = split_text(text, 100, 10)
+
+    assert_chunks_consistent(text, chunks, 100)
+    assert "".join(chunk_text for chunk_text, _ in chunks) == text
+
+
+@pytest.mark.parametrize("chunk_tokens, overlap_tokens", [(0, 0), (-5, 0), (10, -1)])
+def test_invalid_sizes_raise(chunk_tokens, overlap_tokens):
+    with pytest.raises(ValueError):
+        split_text("abc def", chunk_tokens, overlap_tokens)
+
+
+def test_max_chunk_tokens_leaves_headroom():
+    assert max_chunk_tokens("mxbai-embed-large:latest", 512) == 458
+    assert max_chunk_tokens("llama3.1:latest", 512) == 512